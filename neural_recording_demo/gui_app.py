@@ -1,25 +1,373 @@
+import csv
+import functools
+import itertools
 import sys
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+import threading
+import time
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, QHeaderView,
                              QLabel, QTabWidget, QMessageBox, QStatusBar, QDialog, QFormLayout, QLineEdit, QComboBox, QDateEdit, 
-                             QDialogButtonBox, QFileDialog, QGroupBox)
+                             QDialogButtonBox, QFileDialog, QGroupBox, QProgressDialog)
                              
-from PyQt5.QtCore import Qt, QDate
+from PyQt5.QtCore import (Qt, QDate, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QObject,
+                          QThread, QTimer, pyqtSignal)
 from PyQt5.QtGui import QFont
 import datajoint as dj
 
-import matplotlib
-matplotlib.use('Qt5Agg')
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 import numpy as np
 
 # DataJoint schema
-from neural_pipeline import Subject, Session, Recording, RecordingStats, schema
+from neural_pipeline import (Subject, Session, Recording, RecordingStats, schema,
+                             count_query, populate_stats_parallel)
+
+# Table and displayed columns for each tab, keyed by the name passed to create_table_tab
+TABLE_SPECS = {
+    'Subjects': (Subject, ['subject_id', 'subject_name', 'species', 'sex', 'date_of_birth']),
+    'Sessions': (Session, ['subject_id', 'session_id', 'session_date', 'experimenter', 'brain_region']),
+    'Recordings': (Recording, ['subject_id', 'session_id', 'recording_id', 'recording_time',
+                               'num_channels', 'sampling_rate']),
+    'Recording Stats': (RecordingStats, ['subject_id', 'session_id', 'recording_id',
+                                         'mean_amplitude', 'peak_amplitude', 'noise_level']),
+}
+
+# The GUI and its worker threads share DataJoint's single connection, which is not
+# thread-safe; every query from this module runs under this lock
+db_lock = threading.RLock()
+
+# Seconds a status-bar count query stays fresh
+STATUS_TTL = 2.0
+# Milliseconds before the status bar retries counts a busy connection held up
+STATUS_RETRY_MS = 500
+# Pending recordings counted exactly before Compute Statistics reports "N+"
+PENDING_PROBE_LIMIT = 1000
+# Seconds fetched records are reused by a repeated refresh
+FETCH_TTL = 5.0
+# Seconds a prefetched tab stays usable before it is dropped as stale
+PREFETCH_TTL = 10.0
+# Rows a table tab fetches from the database at a time as the user scrolls
+PAGE_SIZE = 500
+# Records an uncached export fetches and writes per query
+EXPORT_CHUNK_ROWS = 10_000
+# Milliseconds of typing pause before the search filter runs
+SEARCH_DELAY_MS = 150
+
+# Application-wide stylesheet, parsed once at startup. Table views take their
+# style from here rather than from a sheet of their own per tab.
+_QSS = """
+    QMainWindow {
+        background-color: #f5f5f5;
+    }
+    QPushButton {
+        background-color: #4a90e2;
+        color: white;
+        border: none;
+        padding: 8px 16px;
+        font-size: 11pt;
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background-color: #357abd;
+    }
+    QPushButton:pressed {
+        background-color: #2868a8;
+    }
+    QTabWidget::pane {
+        border: 1px solid #cccccc;
+        background: white;
+    }
+    QTabBar::tab {
+        background: #e0e0e0;
+        padding: 8px 16px;
+        margin-right: 2px;
+    }
+    QTabBar::tab:selected {
+        background: #4a90e2;
+        color: white;
+    }
+    QTableView {
+        gridline-color: #d0d0d0;
+        background-color: white;
+    }
+    QTableView::item {
+        padding: 5px;
+    }
+    QHeaderView::section {
+        background-color: #4a90e2;
+        color: white;
+        padding: 5px;
+        font-weight: bold;
+    }
+"""
+
+def fetch_columns(name, **fetch_kwargs):
+    """Fetch only the displayed columns of a tab's table as a list of dicts"""
+    dj_table, columns = TABLE_SPECS[name]
+    table = dj_table()
+    # Primary-key attributes come through proj automatically
+    with db_lock:
+        return table.proj(*[c for c in columns if c not in table.primary_key]).fetch(
+            as_dict=True, **fetch_kwargs)
+
+def fetch_column_pages(name, page_size=EXPORT_CHUNK_ROWS, offset=0):
+    """Yield a tab's records in primary-key order from offset, page_size records per query"""
+    while True:
+        page = fetch_columns(name, limit=page_size, offset=offset, order_by='KEY')
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        offset += page_size
+
+_row_formatters = {}
+
+def row_formatter(columns):
+    """
+    Return a function turning a record into its row of display strings.
+    The function is generated once per column list so the per-row work is a
+    fixed sequence of lookups with no loop over columns.
+    """
+    key = tuple(columns)
+    if key not in _row_formatters:
+        cells = ', '.join(f"'' if r.get({c!r}) is None else str(r[{c!r}])" for c in key)
+        namespace = {}
+        exec(f'def fmt(r):\n    return [{cells}]', namespace)
+        _row_formatters[key] = namespace['fmt']
+    return _row_formatters[key]
+
+class FetchWorker(QObject):
+    """Fetch tab tables on a worker thread and post each result back"""
+    finished = pyqtSignal(str, list)
+    failed = pyqtSignal(str)
+    done = pyqtSignal(bool)
+
+    def __init__(self, names, action='fetch data', limit=PAGE_SIZE):
+        super().__init__()
+        self.names = names
+        self._action = action
+        self._limit = limit  # None fetches every record
+
+    def run(self):
+        try:
+            for name in self.names:
+                self.finished.emit(name, fetch_columns(name, limit=self._limit, order_by='KEY'))
+        except Exception as e:
+            self.failed.emit(f'Failed to {self._action}: {str(e)}')
+            self.done.emit(False)
+        else:
+            self.done.emit(True)
+
+class RowsWorker(QObject):
+    """Fetch a tab's records after its loaded ones on a worker thread"""
+    finished = pyqtSignal(str, int, list, bool)  # tab, offset, records, more may follow
+    failed = pyqtSignal(str, int, str)
+    done = pyqtSignal(bool)
+
+    def __init__(self, name, offset, limit):
+        super().__init__()
+        self._name = name
+        self._offset = offset
+        self._limit = limit  # None fetches every remaining record
+
+    def run(self):
+        try:
+            records = fetch_columns(self._name, limit=self._limit, offset=self._offset,
+                                    order_by='KEY')
+        except Exception as e:
+            self.failed.emit(self._name, self._offset, f'Failed to load more rows: {str(e)}')
+            self.done.emit(False)
+        else:
+            more = self._limit is not None and len(records) >= self._limit
+            self.finished.emit(self._name, self._offset, records, more)
+            self.done.emit(True)
+
+class PopulateWorker(QObject):
+    """Populate RecordingStats in parallel processes, driven from a worker thread"""
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(int)
+    failed = pyqtSignal(str)
+    done = pyqtSignal(bool)
+
+    def run(self):
+        try:
+            with db_lock:
+                keys = (Recording() - RecordingStats()).fetch('KEY')
+            completed = 0
+            # Pool workers open connections of their own
+            for n in populate_stats_parallel(keys):
+                completed += n
+                self.progress.emit(completed)
+        except Exception as e:
+            self.failed.emit(f'Failed to compute statistics: {str(e)}')
+            self.done.emit(False)
+        else:
+            self.finished.emit(completed)
+            self.done.emit(True)
+
+class DJTableModel(QAbstractTableModel):
+    """
+    Table model over fetched DataJoint records; cells are rendered on demand.
+    Rows are exposed PAGE_SIZE at a time as the view scrolls towards the end.
+    When more is set, request_rows(offset, limit) is called once every loaded
+    record is shown; it fetches off the GUI thread and hands the records back
+    through add_records.
+    """
+    def __init__(self, records, columns, parent=None, more=False, request_rows=None):
+        super().__init__(parent)
+        self._records = records
+        self._columns = columns
+        self._fmt = row_formatter(columns)
+        self._rows = self._format(records[:PAGE_SIZE])
+        self._search_keys = []
+        self._sort_ranks = {}
+        self._more = more
+        self._request_rows = request_rows
+        self._requested = False  # a fetch of more records is running
+        self._want_all = False  # every record should be shown, e.g. for a search
+
+    def set_records(self, records, more=False):
+        """Replace the records in place so attached views and proxies stay connected"""
+        self.beginResetModel()
+        self._records = records
+        self._rows = self._format(records[:PAGE_SIZE])
+        self._search_keys = []
+        self._sort_ranks = {}
+        self._more = more
+        self._requested = False
+        self._want_all = False
+        self.endResetModel()
+
+    def _format(self, records):
+        # Format a page of cells once so data() is a plain list lookup
+        fmt = self._fmt
+        return [fmt(record) for record in records]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and (len(self._rows) < len(self._records)
+                                         or (self._more and not self._requested))
+
+    def fetchMore(self, parent=QModelIndex()):
+        start = len(self._rows)
+        if start < len(self._records):
+            self._show_rows(start + PAGE_SIZE)
+        elif self._more and not self._requested:
+            self._requested = True
+            self._request_rows(start, PAGE_SIZE)
+
+    def fetch_all(self):
+        """
+        Show every row, e.g. before filtering or sorting across all rows. Records
+        not loaded yet are requested in one fetch and shown when they arrive.
+        """
+        self._want_all = True
+        if not self._more:
+            self._show_rows(len(self._records))
+        elif not self._requested:
+            self._requested = True
+            self._request_rows(len(self._records), None)
+
+    def add_records(self, records, more):
+        """Append records fetched after the loaded ones and show them"""
+        # Records may be the tab's cached list, so fetched pages stay cached
+        self._records.extend(records)
+        self._more = more
+        self._requested = False
+        if self._want_all:
+            self.fetch_all()
+        else:
+            self._show_rows(len(self._rows) + PAGE_SIZE)
+
+    def _show_rows(self, end):
+        # Expose the loaded records up to end as rows; an active proxy filters
+        # and sorts the inserted rows itself
+        start = len(self._rows)
+        end = min(end, len(self._records))
+        if end <= start:
+            return
+        self.beginInsertRows(QModelIndex(), start, end - 1)
+        self._rows.extend(self._format(self._records[start:end]))
+        self._sort_ranks = {}
+        self.endInsertRows()
+
+    def search_key(self, row):
+        """Lower-cased text of a whole row, built the first time a search needs it"""
+        keys = self._search_keys
+        if row >= len(keys):
+            keys.extend('\x1f'.join(cells).lower() for cells in self._rows[len(keys):row + 1])
+        return keys[row]
+
+    def sort_ranks(self, column):
+        """
+        Position of each loaded row when ordered by the column's raw values, so
+        numbers, dates and times sort by value rather than by their text
+        """
+        ranks = self._sort_ranks.get(column)
+        if ranks is None:
+            name = self._columns[column]
+            records = self._records
+            # Missing values sort first
+            order = sorted(range(len(self._rows)),
+                           key=lambda i: (records[i].get(name) is not None, records[i].get(name)))
+            ranks = [0] * len(order)
+            for position, row in enumerate(order):
+                ranks[row] = position
+            self._sort_ranks[column] = ranks
+        return ranks
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self._columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._columns[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        return None
+
+class RecordFilterProxy(QSortFilterProxyModel):
+    """
+    Case-insensitive substring filter matched against each row's cached search key.
+    Sorting compares precomputed ranks of the raw values instead of display text.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_text = ''
+
+    def set_search_text(self, text):
+        self.search_text = text.lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return not self.search_text or self.search_text in self.sourceModel().search_key(source_row)
+
+    def lessThan(self, left, right):
+        ranks = self.sourceModel().sort_ranks(left.column())
+        return ranks[left.row()] < ranks[right.row()]
+
+@functools.lru_cache(maxsize=None)
+def _get_mpl():
+    """Import matplotlib's Qt canvas on first use so browsing tables never pays for it"""
+    import matplotlib
+    matplotlib.use('Qt5Agg')
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+    from matplotlib.figure import Figure
+    return FigureCanvasQTAgg, Figure
 
 class VisualizationDialog(QDialog):
     """Dialog to show embedded matplotlib visualization"""
-    def __init__(self, parent=None):
+    def __init__(self, stats_data, parent=None):
         super().__init__(parent)
+        self.stats_data = stats_data
         self.setWindowTitle('Recording Statistics Visualization')
         self.setGeometry(100, 100, 1000, 800)
         self.initUI()
@@ -28,7 +376,8 @@ class VisualizationDialog(QDialog):
         layout = QVBoxLayout(self)
         
         # Create matplotlib figure
-        self.figure = Figure(figsize=(10, 8))
+        FigureCanvas, Figure = _get_mpl()
+        self.figure = Figure(figsize=(10, 8), constrained_layout=True)
         self.canvas = FigureCanvas(self.figure)
         layout.addWidget(self.canvas)
         
@@ -40,10 +389,15 @@ class VisualizationDialog(QDialog):
         # Generate plot
         self.plot_statistics()
         
+    def histogram(self, ax, values, color, bins=15):
+        """Bin with np.histogram and draw the bars directly instead of through Axes.hist"""
+        counts, edges = np.histogram(values, bins=bins)
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+               color=color, edgecolor='black', alpha=0.7)
+
     def plot_statistics(self):
         """Create statistics visualization"""
-        # Fetch all statistics
-        stats_data = RecordingStats.fetch(as_dict=True)
+        stats_data = self.stats_data
         
         if not stats_data:
             self.figure.text(0.5, 0.5, 'No statistics available', 
@@ -51,60 +405,81 @@ class VisualizationDialog(QDialog):
             self.canvas.draw()
             return
         
-        mean_amps = [s['mean_amplitude'] for s in stats_data]
-        peak_amps = [s['peak_amplitude'] for s in stats_data]
-        noise_levels = [s['noise_level'] for s in stats_data]
+        # One float32 array of (mean, peak, noise) columns; averages in a single pass
+        metrics = np.array([(s['mean_amplitude'], s['peak_amplitude'], s['noise_level'])
+                            for s in stats_data], dtype=np.float32)
+        mean_amps, peak_amps, noise_levels = metrics.T
+        avg_mean, avg_peak, avg_noise = metrics.mean(axis=0)
         
         # Create 2x2 subplot
         axes = self.figure.subplots(2, 2)
         self.figure.suptitle('Recording Statistics Summary', fontsize=14, fontweight='bold')
         
         # Plot 1: Mean Amplitude
-        axes[0, 0].hist(mean_amps, bins=15, color='skyblue', edgecolor='black', alpha=0.7)
+        self.histogram(axes[0, 0], mean_amps, color='skyblue')
         axes[0, 0].set_xlabel('Mean Amplitude (μV)')
         axes[0, 0].set_ylabel('Count')
         axes[0, 0].set_title('Mean Amplitude Distribution')
-        axes[0, 0].axvline(np.mean(mean_amps), color='red', linestyle='--',
-                          label=f'Avg: {np.mean(mean_amps):.2f} μV')
+        axes[0, 0].axvline(avg_mean, color='red', linestyle='--',
+                          label=f'Avg: {avg_mean:.2f} μV')
         axes[0, 0].legend()
         axes[0, 0].grid(True, alpha=0.3)
         
         # Plot 2: Peak Amplitude
-        axes[0, 1].hist(peak_amps, bins=15, color='coral', edgecolor='black', alpha=0.7)
+        self.histogram(axes[0, 1], peak_amps, color='coral')
         axes[0, 1].set_xlabel('Peak Amplitude (μV)')
         axes[0, 1].set_ylabel('Count')
         axes[0, 1].set_title('Peak Amplitude Distribution')
-        axes[0, 1].axvline(np.mean(peak_amps), color='red', linestyle='--',
-                          label=f'Avg: {np.mean(peak_amps):.2f} μV')
+        axes[0, 1].axvline(avg_peak, color='red', linestyle='--',
+                          label=f'Avg: {avg_peak:.2f} μV')
         axes[0, 1].legend()
         axes[0, 1].grid(True, alpha=0.3)
         
         # Plot 3: Noise Level
-        axes[1, 0].hist(noise_levels, bins=15, color='lightgreen', edgecolor='black', alpha=0.7)
+        self.histogram(axes[1, 0], noise_levels, color='lightgreen')
         axes[1, 0].set_xlabel('Noise Level (μV)')
         axes[1, 0].set_ylabel('Count')
         axes[1, 0].set_title('Noise Level Distribution')
-        axes[1, 0].axvline(np.mean(noise_levels), color='red', linestyle='--',
-                          label=f'Avg: {np.mean(noise_levels):.2f} μV')
+        axes[1, 0].axvline(avg_noise, color='red', linestyle='--',
+                          label=f'Avg: {avg_noise:.2f} μV')
         axes[1, 0].legend()
         axes[1, 0].grid(True, alpha=0.3)
         
-        # Plot 4: Scatter
-        scatter = axes[1, 1].scatter(mean_amps, peak_amps, s=100, alpha=0.6,
-                                    c=noise_levels, cmap='viridis', edgecolor='black')
+        # Plot 4: Peak vs Mean, binned so the cost does not grow with one marker per recording;
+        # each cell is colored by the mean noise of the recordings that fall in it
+        noise_sums, x_edges, y_edges = np.histogram2d(mean_amps, peak_amps, bins=20,
+                                                      weights=noise_levels)
+        counts = np.histogram2d(mean_amps, peak_amps, bins=[x_edges, y_edges])[0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_noise = np.ma.masked_invalid(noise_sums / counts)
+        mesh = axes[1, 1].pcolormesh(x_edges, y_edges, mean_noise.T, cmap='viridis')
         axes[1, 1].set_xlabel('Mean Amplitude (μV)')
         axes[1, 1].set_ylabel('Peak Amplitude (μV)')
         axes[1, 1].set_title('Peak vs Mean Amplitude')
         axes[1, 1].grid(True, alpha=0.3)
-        cbar = self.figure.colorbar(scatter, ax=axes[1, 1])
+        cbar = self.figure.colorbar(mesh, ax=axes[1, 1])
         cbar.set_label('Noise (μV)')
         
-        self.figure.tight_layout()
         self.canvas.draw()
 
 class NeuralDataManager(QMainWindow):
     def __init__(self):
         super().__init__()
+        self._conn = schema.connection  # reused by every query for the window's lifetime
+        self._views = {}
+        self._threads = set()
+        self._status_cache = None
+        self._status_retry = None  # max_age of a status-bar update waiting for the connection
+        self._cache = {}  # tab name -> last fetched records
+        self._fetched_at = {}  # tab name -> time its cached records were fetched
+        self._prefetched = {}  # tab name -> time its cached records were prefetched
+        self._partial = set()  # tabs whose cached records are only the leading pages
+        self._in_flight = set()  # tab names with a prefetch running
+        self._loading = set()  # tab names with a refresh running
+        self._stale = set()  # loading tab names modified since their refresh started
+        self._compute_running = False  # a Compute Statistics run is in progress
+        self._viz_dialog = None  # last visualization dialog, reused while stats are unchanged
+        self._viz_stats_count = None  # RecordingStats row count it was drawn from
         self.initUI()
         
     def initUI(self):
@@ -136,8 +511,8 @@ class NeuralDataManager(QMainWindow):
         add_subject_action = data_menu.addAction('Add Subject')
         add_subject_action.triggered.connect(self.add_subject)
         
-        compute_action = data_menu.addAction('Compute Statistics')
-        compute_action.triggered.connect(self.compute_statistics)
+        self.compute_action = data_menu.addAction('Compute Statistics')
+        self.compute_action.triggered.connect(self.compute_statistics)
         
         # View menu
         view_menu = menubar.addMenu('View')
@@ -175,16 +550,17 @@ class NeuralDataManager(QMainWindow):
         self.tabs = QTabWidget()
         main_layout.addWidget(self.tabs)
         
-        # Create tabs for each table
-        self.subject_tab = self.create_table_tab("Subjects")
-        self.session_tab = self.create_table_tab("Sessions")
-        self.recording_tab = self.create_table_tab("Recordings")
-        self.stats_tab = self.create_table_tab("Recording Stats")
+        # Tabs start as empty placeholders; each table is built on first activation
+        self.subject_tab = QWidget()
+        self.session_tab = QWidget()
+        self.recording_tab = QWidget()
+        self.stats_tab = QWidget()
         
         self.tabs.addTab(self.subject_tab, "Subjects")
         self.tabs.addTab(self.session_tab, "Sessions")
         self.tabs.addTab(self.recording_tab, "Recordings")
         self.tabs.addTab(self.stats_tab, "Statistics")
+        self.tabs.currentChanged.connect(self._on_tab_changed)
         
         # Control buttons
         button_layout = QHBoxLayout()
@@ -217,8 +593,8 @@ class NeuralDataManager(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.update_status()
         
-        # Load initial data
-        self.refresh_all_tables()
+        # Build and load the visible tab only
+        self._on_tab_changed(self.tabs.currentIndex())
         
     def create_table_tab(self, name):
         """Create a tab with a table widget and search functionality"""
@@ -230,30 +606,39 @@ class NeuralDataManager(QMainWindow):
         search_label = QLabel('Search:')
         search_input = QLineEdit()
         search_input.setPlaceholderText('Type to filter...')
-        search_input.textChanged.connect(lambda text: self.filter_table(table, text))
+        # Collapse bursts of keystrokes into a single filter pass
+        search_timer = QTimer(tab)
+        search_timer.setSingleShot(True)
+        search_timer.setInterval(SEARCH_DELAY_MS)
+        search_timer.timeout.connect(lambda: self.filter_table(table, search_input.text()))
+        search_input.textChanged.connect(lambda text: search_timer.start())
         search_layout.addWidget(search_label)
         search_layout.addWidget(search_input)
         search_layout.addStretch()
         layout.addLayout(search_layout)
         
-        # Table widget
-        table = QTableWidget()
+        # Table view
+        table = QTableView()
         table.setAlternatingRowColors(True)
-        table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #d0d0d0;
-                background-color: white;
-            }
-            QTableWidget::item {
-                padding: 5px;
-            }
-            QHeaderView::section {
-                background-color: #4a90e2;
-                color: white;
-                padding: 5px;
-                font-weight: bold;
-            }
-        """)
+        
+        # Search filtering runs through a proxy over the data model
+        proxy = RecordFilterProxy(table)
+        table.setModel(proxy)
+        
+        # Size columns from the header and the first rows rather than every row
+        header = table.horizontalHeader()
+        header.setResizeContentsPrecision(50)
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        # Fixed row heights: no per-row size hints to compute
+        rows = table.verticalHeader()
+        rows.setSectionResizeMode(QHeaderView.Fixed)
+        rows.setDefaultSectionSize(24)
+        
+        # Click a header to sort; start in database order. Sorting covers every
+        # row, so the remaining rows are loaded and sorted in as they arrive.
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        table.setSortingEnabled(True)
+        header.sortIndicatorChanged.connect(lambda section, order: self.load_all_rows(table))
         
         layout.addWidget(table)
         
@@ -263,6 +648,7 @@ class NeuralDataManager(QMainWindow):
         layout.addWidget(count_label)
         
         # Store references
+        self._views[name] = (table, count_label)
         if name == "Subjects":
             self.subject_table = table
             self.subject_count_label = count_label
@@ -278,92 +664,240 @@ class NeuralDataManager(QMainWindow):
             
         return tab
     
+    def load_all_rows(self, table):
+        """Show every row of a tab's model, fetching the rest in the background"""
+        model = table.model().sourceModel()
+        if model is not None:
+            model.fetch_all()
+
     def filter_table(self, table, search_text):
         """Filter table rows based on search text"""
-        for row in range(table.rowCount()):
-            match = False
-            for col in range(table.columnCount()):
-                item = table.item(row, col)
-                if item and search_text.lower() in item.text().lower():
-                    match = True
-                    break
-            table.setRowHidden(row, not match)
-
-    def populate_table(self, table_widget, dj_table, columns, count_label=None):
-        """Populate a QTableWidget with data from a DataJoint table"""
-        # Fetch data
-        data = dj_table.fetch(as_dict=True)
-        
-        # Set table dimensions
-        table_widget.setRowCount(len(data))
-        table_widget.setColumnCount(len(columns))
-        table_widget.setHorizontalHeaderLabels(columns)
-        
-        # Populate data
-        for row_idx, record in enumerate(data):
-            for col_idx, column in enumerate(columns):
-                value = str(record.get(column, ''))
-                item = QTableWidgetItem(value)
-                item.setTextAlignment(Qt.AlignCenter)
-                table_widget.setItem(row_idx, col_idx, item)
-        
-        # Resize columns to content
-        table_widget.resizeColumnsToContents()
+        if search_text:
+            self.load_all_rows(table)  # match rows not scrolled into view yet
+        table.model().set_search_text(search_text)
+
+    def populate_table(self, table_widget, data, columns, count_label=None,
+                       more=False, request_rows=None, total=None):
+        """
+        Populate a QTableView with records fetched from a DataJoint table.
+        If more is set, data holds only the leading pages and request_rows(offset,
+        limit) fetches the rest as the view needs it; total is then the full row count.
+        """
+        # Reset the tab's model over the fetched records; cells render on demand
+        # Sorting and repaints are paused so the whole reset costs one sort and one paint
+        proxy = table_widget.model()
+        model = proxy.sourceModel()
+        sorting = table_widget.isSortingEnabled()
+        table_widget.setSortingEnabled(False)
+        table_widget.setUpdatesEnabled(False)
+        if model is None:
+            proxy.setSourceModel(DJTableModel(data, columns, table_widget, more, request_rows))
+        else:
+            model.set_records(data, more)
+        if proxy.search_text or table_widget.horizontalHeader().sortIndicatorSection() >= 0:
+            proxy.sourceModel().fetch_all()  # an active search or sort must see every row
+        table_widget.setSortingEnabled(sorting)
+        table_widget.setUpdatesEnabled(True)
 
         # Update count label
         if count_label:
-            count_label.setText(f'Total entries: {len(data)}')
+            count_label.setText(f'Total entries: {len(data) if total is None else total}')
     
+    def start_worker(self, worker):
+        """Run a worker object on its own QThread until it reports done"""
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        # Quit from the worker's thread, so closeEvent's wait() cannot block the quit
+        worker.done.connect(thread.quit, Qt.DirectConnection)
+        thread.finished.connect(self._worker_finished)
+        self._threads.add((thread, worker))
+        thread.start()
+
+    def _worker_finished(self):
+        """Release a worker thread once its event loop has exited"""
+        for thread, worker in list(self._threads):
+            if thread.isFinished():
+                self._threads.discard((thread, worker))
+                worker.deleteLater()
+                thread.deleteLater()
+
     def refresh_all_tables(self):
         """Refresh all table views with latest data"""
-        try:
-            # Subject table
-            self.populate_table(
-                self.subject_table, 
-                Subject(), 
-                ['subject_id', 'subject_name', 'species', 'sex', 'date_of_birth'],
-                self.subject_count_label
-            )
-            
-            # Session table
-            self.populate_table(
-                self.session_table,
-                Session(),
-                ['subject_id', 'session_id', 'session_date', 'experimenter', 'brain_region'],
-                self.session_count_label
-            )
-            
-            # Recording table
-            self.populate_table(
-                self.recording_table,
-                Recording(),
-                ['subject_id', 'session_id', 'recording_id', 'recording_time', 
-                 'num_channels', 'sampling_rate'],
-                 self.recording_count_label
-            )
-            
-            # RecordingStats table
-            self.populate_table(
-                self.stats_table,
-                RecordingStats(),
-                ['subject_id', 'session_id', 'recording_id', 
-                 'mean_amplitude', 'peak_amplitude', 'noise_level'],
-                 self.stats_count_label
-            )
-            
-            self.update_status()
+        self.refresh_tables(list(TABLE_SPECS))
+    
+    def invalidate_tables(self, names):
+        """Forget cached records for tables that were just modified"""
+        for name in names:
+            self._cache.pop(name, None)
+            self._fetched_at.pop(name, None)
+            self._prefetched.pop(name, None)
+            self._partial.discard(name)
+    
+    def refresh_tables(self, names, force=False):
+        """
+        Re-fetch the named tables whose tabs are built. Records fetched less than
+        FETCH_TTL seconds ago are kept unless force is set.
+        """
+        now = time.monotonic()
+        if force:
+            self.invalidate_tables(names)
+            # A refresh already running may have read the table before the change
+            self._stale.update(name for name in names if name in self._loading)
+        else:
+            self.invalidate_tables([name for name in names
+                                    if now - self._fetched_at.get(name, now - FETCH_TTL) >= FETCH_TTL])
+        
+        # Tabs not built yet fetch when first opened
+        names = [name for name in names
+                 if name in self._views and name not in self._cache and name not in self._loading]
+        if not names:
+            if force:
+                # Nothing to re-fetch, but the modified tables' counts have changed
+                self.update_status(max_age=0)
+            elif not self._loading:
+                self.status_bar.showMessage('Data is up to date', 3000)
+            return
+        self._loading.update(names)
+        self.refresh_btn.setEnabled(False)
+        self.status_bar.showMessage('Refreshing data...')
+        
+        worker = FetchWorker(names, action='refresh data')
+        worker.finished.connect(self._apply_fetch_results)
+        worker.failed.connect(self._show_worker_error)
+        worker.done.connect(functools.partial(self._refresh_done, names))
+        self.start_worker(worker)
+    
+    def _apply_fetch_results(self, name, data):
+        """Cache one table's fetched records and show them in its tab"""
+        if name in self._stale:
+            return  # refetched once its refresh is done
+        self._store_records(name, data)
+        self._show_records(name)
+    
+    def _store_records(self, name, data):
+        """Cache a table's first page of records; a full page means more may follow"""
+        self._cache[name] = data
+        self._fetched_at[name] = time.monotonic()
+        if len(data) >= PAGE_SIZE:
+            self._partial.add(name)
+        else:
+            self._partial.discard(name)
+    
+    def _show_records(self, name):
+        """Show a table's cached records in its tab, fetching the rest as they are needed"""
+        table, count_label = self._views[name]
+        total = None
+        if name in self._partial:
+            try:
+                total = self.fetch_counts()[list(TABLE_SPECS).index(name)]
+            except Exception:
+                pass  # the label falls back to the loaded row count
+        self.populate_table(table, self._cache[name], TABLE_SPECS[name][1], count_label,
+                            name in self._partial,
+                            functools.partial(self._request_rows, name), total)
+    
+    def _request_rows(self, name, offset, limit):
+        """Fetch a tab's records from offset on a worker; limit None fetches all the rest"""
+        worker = RowsWorker(name, offset, limit)
+        worker.finished.connect(self._add_rows)
+        worker.failed.connect(self._add_rows_failed)
+        self.start_worker(worker)
+    
+    def _add_rows(self, name, offset, data, more):
+        """Append records fetched for a tab's model, unless the tab was reloaded meanwhile"""
+        records = self._cache.get(name)
+        if records is None or len(records) != offset:
+            return
+        if not more:
+            self._partial.discard(name)
+        self._views[name][0].model().sourceModel().add_records(data, more)
+    
+    def _add_rows_failed(self, name, offset, message):
+        """Stop paging a tab whose next records could not be fetched"""
+        self.status_bar.showMessage(message, 5000)
+        records = self._cache.get(name)
+        if records is not None and len(records) == offset:
+            self._views[name][0].model().sourceModel().add_records([], False)
+    
+    def _build_tab(self, index):
+        """Build the table for a placeholder tab the first time it is opened"""
+        layout = QVBoxLayout(self.tabs.widget(index))
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.create_table_tab(list(TABLE_SPECS)[index]))
+    
+    def _on_tab_changed(self, index):
+        """Build and load the opened tab, then prefetch the one after it"""
+        names = list(TABLE_SPECS)
+        now = time.monotonic()
+        for name, fetched_at in list(self._prefetched.items()):
+            if now - fetched_at >= PREFETCH_TTL:
+                self.invalidate_tables([name])
+        
+        name = names[index]
+        just_built = name not in self._views
+        if just_built:
+            self._build_tab(index)
+        prefetched = self._prefetched.pop(name, None) is not None
+        if name in self._cache:
+            if just_built or prefetched:
+                self._show_records(name)
+        elif just_built and name not in self._in_flight:
+            self.refresh_tables([name])
+        
+        next_name = names[(index + 1) % len(names)]
+        if next_name in self._cache or next_name in self._in_flight:
+            return
+        self._in_flight.add(next_name)
+        worker = FetchWorker([next_name], action='prefetch data')
+        worker.finished.connect(self._store_prefetch)
+        worker.done.connect(functools.partial(self._prefetch_done, [next_name]))
+        self.start_worker(worker)
+    
+    def _store_prefetch(self, name, data):
+        if name in self._cache or name in self._loading:
+            return  # a refresh already has newer records
+        self._store_records(name, data)
+        if name in self._views and self.tabs.currentIndex() == list(TABLE_SPECS).index(name):
+            self._show_records(name)
+        else:
+            self._prefetched[name] = time.monotonic()
+    
+    def _prefetch_done(self, names, ok):
+        for name in names:
+            self._in_flight.discard(name)
+    
+    def _refresh_done(self, names, ok):
+        for name in names:
+            self._loading.discard(name)
+        stale = [name for name in names if name in self._stale]
+        if stale:
+            self._stale.difference_update(stale)
+            self.refresh_tables(stale, force=True)
+        if self._loading:
+            return
+        self.refresh_btn.setEnabled(True)
+        self.update_status(max_age=0)  # counts may have changed with the new data
+        if ok:
             self.status_bar.showMessage('Data refreshed successfully', 3000)
-            
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Failed to refresh data: {str(e)}')
+    
+    def _show_worker_error(self, message):
+        QMessageBox.critical(self, 'Error', message)
     
     def compute_statistics(self):
         """Trigger computation of recording statistics"""
+        if self._compute_running:
+            return  # one run at a time; its dialog reports progress
         try:
-            # Check how many recordings need stats
-            recordings_without_stats = len(Recording() - RecordingStats())
+            # Check how many recordings need stats, counting no further than the probe limit
+            with db_lock:
+                pending = (Recording() - RecordingStats()).fetch('KEY', limit=PENDING_PROBE_LIMIT + 1)
+            if len(pending) > PENDING_PROBE_LIMIT:
+                recordings_without_stats = f'{PENDING_PROBE_LIMIT}+'
+            else:
+                recordings_without_stats = len(pending)
             
-            if recordings_without_stats == 0:
+            if not pending:
                 QMessageBox.information(
                     self, 
                     'Already Computed', 
@@ -381,32 +915,95 @@ class NeuralDataManager(QMainWindow):
             
             if reply == QMessageBox.Yes:
                 self.status_bar.showMessage('Computing statistics...')
-                QApplication.processEvents()  # Update UI
+                self._compute_running = True
+                self.compute_btn.setEnabled(False)
+                self.compute_action.setEnabled(False)
                 
-                # Run computation
-                RecordingStats.populate(display_progress=False)
+                # Busy indicator; the window stays responsive underneath
+                dialog = QProgressDialog('Computing statistics...', None, 0, 0, self)
+                dialog.setWindowTitle('Compute Statistics')
+                dialog.setWindowModality(Qt.WindowModal)
+                dialog.setMinimumDuration(0)
+                dialog.show()
                 
-                # Refresh tables
-                self.refresh_all_tables()
-                
-                QMessageBox.information(
-                    self,
-                    'Success',
-                    f' Computed statistics for {recordings_without_stats} recordings!'
-                )
+                # Run computation off the GUI thread; the slots get this run's dialog
+                worker = PopulateWorker()
+                worker.progress.connect(
+                    functools.partial(self._compute_progress, dialog, recordings_without_stats))
+                worker.finished.connect(self._compute_finished)
+                worker.failed.connect(self._show_worker_error)
+                worker.done.connect(functools.partial(self._compute_done, dialog))
+                self.start_worker(worker)
                 
         except Exception as e:
             QMessageBox.critical(self, 'Error', f'Failed to compute statistics: {str(e)}')
     
+    def _compute_progress(self, dialog, pending, completed):
+        message = f'Computing statistics... {completed}/{pending} recordings'
+        self.status_bar.showMessage(message)
+        dialog.setLabelText(message)
+    
+    def _compute_done(self, dialog, ok):
+        dialog.close()
+        dialog.deleteLater()
+        self._compute_running = False
+        self.compute_btn.setEnabled(True)
+        self.compute_action.setEnabled(True)
+    
+    def _compute_finished(self, completed):
+        # Only the stats table changed
+        self.invalidate_visualizations()
+        self.refresh_tables(['Recording Stats'], force=True)
+        
+        QMessageBox.information(
+            self,
+            'Success',
+            f' Computed statistics for {completed} recordings!'
+        )
+    
     def show_visualizations(self):
         """Show visualization plots"""
+        if self._viz_dialog is not None:
+            try:
+                unchanged = self.fetch_counts(stale_ok=False)[3] == self._viz_stats_count
+            except Exception:
+                unchanged = False
+            if unchanged:
+                self._viz_dialog.exec_()  # nothing to redraw
+                return
+            self.invalidate_visualizations()
+        if 'Recording Stats' in self._cache and 'Recording Stats' not in self._partial:
+            self._open_visualizations('Recording Stats', self._cache['Recording Stats'])
+            return
+        worker = FetchWorker(['Recording Stats'], action='create visualizations', limit=None)
+        worker.finished.connect(self._open_visualizations)
+        worker.failed.connect(self._show_worker_error)
+        self.start_worker(worker)
+    
+    def _open_visualizations(self, name, stats_data):
         try:
-            dialog = VisualizationDialog(self)
+            dialog = VisualizationDialog(stats_data, self)
+            self._viz_dialog = dialog
+            self._viz_stats_count = len(stats_data)
             dialog.exec_()
             
         except Exception as e:
             QMessageBox.critical(self, 'Error', f'Failed to create visualizations: {str(e)}')
     
+    def invalidate_visualizations(self):
+        """Drop the cached visualization dialog so the next one is redrawn"""
+        if self._viz_dialog is not None:
+            self._viz_dialog.deleteLater()
+        self._viz_dialog = None
+        self._viz_stats_count = None
+    
+    def closeEvent(self, event):
+        """Let running workers finish before the window goes away"""
+        for thread, worker in list(self._threads):
+            thread.wait()
+        self._conn.close()
+        super().closeEvent(event)
+
     def show_about(self):
         """Show about dialog"""
         QMessageBox.about(
@@ -430,9 +1027,11 @@ class NeuralDataManager(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             try:
                 data = dialog.get_data()
-                Subject.insert1(data)
+                with db_lock:
+                    Subject.insert1(data)
                 
-                self.refresh_all_tables()
+                # Only the subject table changed
+                self.refresh_tables(['Subjects'], force=True)
                 
                 QMessageBox.information(
                     self,
@@ -450,22 +1049,21 @@ class NeuralDataManager(QMainWindow):
     def export_data(self):
         """Export current tab's data to CSV"""
         try:
-            import pandas as pd
-            
             # Get current tab
             current_tab_index = self.tabs.currentIndex()
-            tab_names = ['Subjects', 'Sessions', 'Recordings', 'Statistics']
-            current_tab_name = tab_names[current_tab_index]
+            current_tab_name = self.tabs.tabText(current_tab_index)
+            table_name = list(TABLE_SPECS)[current_tab_index]
             
-            # Get corresponding DataJoint table
-            if current_tab_index == 0:
-                data = Subject.fetch(as_dict=True)
-            elif current_tab_index == 1:
-                data = Session.fetch(as_dict=True)
-            elif current_tab_index == 2:
-                data = Recording.fetch(as_dict=True)
+            # Export the cached records and fetch only what is not cached yet,
+            # one chunk at a time
+            cached = self._cache.get(table_name)
+            if cached is None:
+                pages = fetch_column_pages(table_name)
+            elif table_name in self._partial:
+                pages = itertools.chain([cached], fetch_column_pages(table_name, offset=len(cached)))
             else:
-                data = RecordingStats.fetch(as_dict=True)
+                pages = iter([cached])
+            data = next(pages, None)
             
             if not data:
                 QMessageBox.warning(self, 'No Data', 'No data to export!')
@@ -480,32 +1078,57 @@ class NeuralDataManager(QMainWindow):
             )
             
             if filename:
-                # Convert to DataFrame and save
-                df = pd.DataFrame(data)
-                df.to_csv(filename, index=False)
+                # Write rows straight from the fetched records
+                with open(filename, 'w', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=list(data[0].keys()))
+                    writer.writeheader()
+                    writer.writerows(data)
+                    num_rows = len(data)
+                    for data in pages:
+                        writer.writerows(data)
+                        num_rows += len(data)
                 
                 QMessageBox.information(
                     self,
                     'Success',
-                    f'✓ Exported {len(data)} rows to:\n{filename}'
+                    f'✓ Exported {num_rows} rows to:\n{filename}'
                 )
                 
-        except ImportError:
-            QMessageBox.warning(
-                self,
-                'Missing Dependency',
-                'Please install pandas: pip install pandas'
-            )
         except Exception as e:
             QMessageBox.critical(self, 'Error', f'Failed to export: {str(e)}')
 
-    def update_status(self):
+    def fetch_counts(self, max_age=STATUS_TTL, stale_ok=True):
+        """
+        Return table counts from one query, reusing a result younger than max_age seconds.
+        The GUI thread never waits for a worker's query: while one holds the connection
+        the last counts are returned if stale_ok is set, otherwise None.
+        """
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cache[0] < max_age:
+            return self._status_cache[1]
+        if not db_lock.acquire(blocking=False):
+            if stale_ok and self._status_cache is not None:
+                return self._status_cache[1]
+            return None
+        try:
+            counts = self._conn.query(count_query()).fetchone()
+        finally:
+            db_lock.release()
+        self._status_cache = (now, counts)
+        return counts
+
+    def update_status(self, max_age=STATUS_TTL):
         """Update status bar with database stats"""
         try:
-            num_subjects = len(Subject())
-            num_sessions = len(Session())
-            num_recordings = len(Recording())
-            num_stats = len(RecordingStats())
+            counts = self.fetch_counts(max_age, stale_ok=False)
+            if counts is None:
+                # A worker holds the connection; try again shortly
+                if self._status_retry is None:
+                    QTimer.singleShot(STATUS_RETRY_MS, self._retry_status)
+                    self._status_retry = max_age
+                self._status_retry = min(self._status_retry, max_age)
+                return
+            num_subjects, num_sessions, num_recordings, num_stats = counts
             
             status_text = (f'Database: {num_subjects} Subjects | {num_sessions} Sessions | '
                           f'{num_recordings} Recordings | {num_stats} Computed Stats')
@@ -513,6 +1136,10 @@ class NeuralDataManager(QMainWindow):
             
         except Exception as e:
             self.status_bar.showMessage(f'Error: {str(e)}')
+    
+    def _retry_status(self):
+        max_age, self._status_retry = self._status_retry, None
+        self.update_status(max_age)
 
 class AddSubjectDialog(QDialog):
     """Dialog for adding a new subject"""
@@ -578,39 +1205,8 @@ def main():
     # Set application style
     app.setStyle('Fusion')
     
-     # Set application-wide stylesheet
-    app.setStyleSheet("""
-        QMainWindow {
-            background-color: #f5f5f5;
-        }
-        QPushButton {
-            background-color: #4a90e2;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            font-size: 11pt;
-            border-radius: 4px;
-        }
-        QPushButton:hover {
-            background-color: #357abd;
-        }
-        QPushButton:pressed {
-            background-color: #2868a8;
-        }
-        QTabWidget::pane {
-            border: 1px solid #cccccc;
-            background: white;
-        }
-        QTabBar::tab {
-            background: #e0e0e0;
-            padding: 8px 16px;
-            margin-right: 2px;
-        }
-        QTabBar::tab:selected {
-            background: #4a90e2;
-            color: white;
-        }
-    """)
+    # Set the application-wide stylesheet once, before any widget exists
+    app.setStyleSheet(_QSS)
 
     # Create and show main window
     window = NeuralDataManager()
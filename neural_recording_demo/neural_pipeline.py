@@ -1,7 +1,26 @@
+import functools
+import logging
+import os
+import random
+import threading
+from multiprocessing import Pool
+
 import datajoint as dj
 import numpy as np
 from datetime import date, timedelta, time
-import matplotlib.pyplot as plt
+
+try:
+    import numba
+except ImportError:  # optional; simulate_stats falls back to NumPy
+    numba = None
+
+try:
+    import cupy as cp
+    import cupyx
+except ImportError:  # optional; signals are simulated on the CPU
+    cp = None
+
+logger = logging.getLogger(__name__)
 
 # Connection
 dj.config['database.host'] = 'localhost'
@@ -44,6 +63,360 @@ class Recording(dj.Manual):
     sampling_rate : float
     """
 
+# Samples below this amplitude (μV) count towards the noise level
+SPIKE_THRESHOLD = 20.0
+# Samples per block in the stats kernel's per-block variance merge
+_STATS_BLOCK = 2048
+# Samples per simulated window in the NumPy fallback (1 MiB of float32)
+_NUMPY_TILE = 1 << 18
+# Shape of one synthetic spike, scaled by its amplitude when injected; built once
+# per process in the signal's float32 so no spike needs a cast or an exp of its own
+_SPIKE_KERNEL = np.exp(-np.linspace(0, 5, 100, dtype=np.float32))
+# Sample offsets of a spike from its start time
+_SPIKE_OFFSETS = np.arange(len(_SPIKE_KERNEL))
+# Length of every simulated recording - tril dummy values
+RECORDING_SECONDS = 10
+# Smallest recording (channels x samples) worth simulating on a GPU; below this,
+# kernel launches and transfers cost more than the CPU paths take
+GPU_MIN_SAMPLES = 1 << 22
+
+def _tile_moments(tile, threshold, magnitude_buffer):
+    # |x| sum and max of a contiguous tile plus the (count, mean, M2) of its samples
+    # below threshold; |x| goes into the reused buffer rather than a fresh allocation
+    tile = tile.reshape(-1)
+    magnitude = np.abs(tile, out=magnitude_buffer[:tile.size])
+    abs_sum = float(magnitude.sum(dtype=np.float64))
+    peak = float(magnitude.max())
+    quiet = tile[tile < threshold]
+    if quiet.size == 0:
+        return abs_sum, peak, 0, 0.0, 0.0
+    tile_mean = float(quiet.mean(dtype=np.float64))
+    tile_m2 = float(np.square(quiet - tile_mean, dtype=np.float64).sum())
+    return abs_sum, peak, quiet.size, tile_mean, tile_m2
+
+def _combine_tile_moments(tiles, size):
+    # Merge the tiles' partials pairwise into mean |x|, peak |x| and noise std
+    abs_sum = peak = count = mean = m2 = 0.0
+    for tile_abs, tile_peak, n, tile_mean, tile_m2 in tiles:
+        abs_sum += tile_abs
+        peak = max(peak, tile_peak)
+        if n == 0:
+            continue
+        total = count + n
+        delta = tile_mean - mean
+        mean += delta * n / total
+        m2 += tile_m2 + delta * delta * count * n / total
+        count = total
+    noise = np.sqrt(m2 / count) if count else np.nan
+    return abs_sum / size, peak, float(noise)
+
+if numba is not None:
+    @numba.njit(fastmath=True, cache=True)
+    def _block_stats(block, threshold):
+        # |x| sum and max plus the exact (count, mean, M2) of the samples below
+        # threshold; the block is small enough to stay in cache for its second pass
+        abs_sum = peak = total = 0.0
+        n = 0
+        for x in block:
+            m = abs(x)
+            abs_sum += m
+            peak = max(peak, m)
+            if x < threshold:
+                n += 1
+                total += x
+        if n == 0:
+            return abs_sum, peak, 0.0, 0.0, 0.0
+        mean = total / n
+        m2 = 0.0
+        for x in block:
+            if x < threshold:
+                m2 += (x - mean) * (x - mean)
+        return abs_sum, peak, float(n), mean, m2
+
+    @numba.njit(cache=True)
+    def _merge_moments(count, mean, m2, n, other_mean, other_m2):
+        # Chan et al.'s pairwise update of (count, mean, M2)
+        if n == 0:
+            return count, mean, m2
+        total = count + n
+        delta = other_mean - mean
+        return total, mean + delta * n / total, m2 + other_m2 + delta * delta * count * n / total
+
+    @numba.njit(cache=True)
+    def _finish_stats(abs_sums, peaks, counts, means, m2s, size):
+        # Combine the per-block partials into mean |x|, peak |x| and noise std
+        count = mean = m2 = 0.0
+        for b in range(len(counts)):
+            count, mean, m2 = _merge_moments(count, mean, m2, counts[b], means[b], m2s[b])
+        noise = np.sqrt(m2 / count) if count > 0 else np.nan
+        return abs_sums.sum() / size, peaks.max(), noise
+
+    _UNIT24 = np.float32(1.0 / (1 << 24))
+
+    @numba.njit(cache=True)
+    def _splitmix64(state):
+        # Advance a splitmix64 state and return it with the next 64 random bits
+        state = state + np.uint64(0x9E3779B97F4A7C15)
+        z = state
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return state, z ^ (z >> np.uint64(31))
+
+    @numba.njit(cache=True)
+    def _noise_state(seed, ch, start):
+        # splitmix64 state just before sample start of channel ch. Every channel has
+        # its own stream derived from seed and each draw adds the same constant, so
+        # any block of any channel can start its noise without generating the rest.
+        return (np.uint64(seed) + np.uint64(ch) * np.uint64(0xD1B54A32D192ED03)
+                + np.uint64(start // 2) * np.uint64(0x9E3779B97F4A7C15))
+
+    @numba.njit(fastmath=True, cache=True)
+    def _fill_noise(block, size, state):
+        # Gaussian noise (std 10) by float32 Box-Muller: one 64-bit draw gives
+        # two 24-bit uniforms, which give two samples
+        for i in range(0, size, 2):
+            state, bits = _splitmix64(state)
+            u1 = np.float32(1.0) - np.float32(bits >> np.uint64(40)) * _UNIT24
+            u2 = np.float32((bits >> np.uint64(16)) & np.uint64(0xFFFFFF)) * _UNIT24
+            radius = np.float32(10.0) * np.sqrt(np.float32(-2.0) * np.log(u1))
+            angle = np.float32(2 * np.pi) * u2
+            block[i] = radius * np.cos(angle)
+            if i + 1 < size:
+                block[i + 1] = radius * np.sin(angle)
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _simulate_stats_kernel(num_channels, num_samples, seed, spike_index, spike_times,
+                               amplitudes, kernel, threshold):
+        # Generate, spike and reduce the signal one cache-sized block at a time, so
+        # the full signal is never materialized. The (channel, block) pairs are
+        # split over threads as one flat range, so the work balances whatever the
+        # channel count; partials are merged in block order afterwards, which keeps
+        # the result independent of thread scheduling. Channel ch's spikes are
+        # spike_times/amplitudes[spike_index[ch]:spike_index[ch + 1]].
+        blocks_per_channel = (num_samples + _STATS_BLOCK - 1) // _STATS_BLOCK
+        num_blocks = num_channels * blocks_per_channel
+        abs_sums = np.zeros(num_blocks)
+        peaks = np.zeros(num_blocks)
+        counts = np.zeros(num_blocks)
+        means = np.zeros(num_blocks)
+        m2s = np.zeros(num_blocks)
+        spike_len = len(kernel)
+        for b in numba.prange(num_blocks):
+            ch = b // blocks_per_channel
+            start = (b % blocks_per_channel) * _STATS_BLOCK
+            size = min(_STATS_BLOCK, num_samples - start)
+            block = np.empty(_STATS_BLOCK, dtype=np.float32)
+            _fill_noise(block, size, _noise_state(seed, ch, start))
+            for j in range(spike_index[ch], spike_index[ch + 1]):
+                t = spike_times[j]
+                for i in range(max(t, start), min(t + spike_len, start + size)):
+                    block[i - start] += amplitudes[j] * kernel[i - t]
+            abs_sums[b], peaks[b], counts[b], means[b], m2s[b] = _block_stats(block[:size], threshold)
+        return _finish_stats(abs_sums, peaks, counts, means, m2s, num_channels * num_samples)
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _channel_noise_kernel(channels, num_samples, seed):
+        # The noise _simulate_stats_kernel generates for the given channels, as rows
+        noise = np.empty((len(channels), num_samples), dtype=np.float32)
+        for row in numba.prange(len(channels)):
+            _fill_noise(noise[row], num_samples, _noise_state(seed, channels[row], 0))
+        return noise
+
+@functools.lru_cache(maxsize=None)
+def gpu_available():
+    """
+    Whether CuPy can reach a CUDA device. Checked on first use rather than at
+    import, so a parent process never initializes CUDA before forking workers.
+    """
+    if cp is None:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+if cp is not None:
+    # (count, mean, M2) of the samples below a threshold, merged pairwise (Chan et al.)
+    # in float64 as the reduction combines partial results
+    _QUIET_MOMENTS = r"""
+    struct quiet_moments {
+        double count, mean, m2;
+        __device__ quiet_moments() : count(0), mean(0), m2(0) {}
+        __device__ quiet_moments(double x, double threshold)
+            : count(x < threshold), mean(x < threshold ? x : 0), m2(0) {}
+        __device__ quiet_moments operator+(const quiet_moments &other) const {
+            double total = count + other.count;
+            if (total == 0) return *this;
+            double delta = other.mean - mean;
+            quiet_moments merged;
+            merged.count = total;
+            merged.mean = mean + delta * other.count / total;
+            merged.m2 = m2 + other.m2 + delta * delta * count * other.count / total;
+            return merged;
+        }
+    };
+    """
+
+    # Noise level in one pass over the signal, with no mask, compacted copy or other
+    # signal-sized temporary
+    _quiet_noise_kernel = cp.ReductionKernel(
+        'T x, float64 threshold', 'float64 noise',
+        'quiet_moments(x, threshold)', 'a + b',
+        'noise = a.count > 0 ? sqrt(a.m2 / a.count) : 0.0 / 0.0',
+        'quiet_moments()', 'quiet_noise', reduce_type='quiet_moments',
+        preamble=_QUIET_MOMENTS)
+
+def _simulate_signal_gpu(num_channels, num_samples, channels, spike_times, amplitudes, seed):
+    """
+    Generate the noisy signal on the GPU and add the given spikes there. CuPy's
+    memory pool keeps the device buffer between calls of the same size.
+    """
+    signal = cp.random.default_rng(seed).standard_normal((num_channels, num_samples),
+                                                         dtype=cp.float32)
+    signal *= 10
+    kernel = cp.asarray(_SPIKE_KERNEL)
+    offsets = cp.asarray(spike_times[:, None] + _SPIKE_OFFSETS)
+    cupyx.scatter_add(signal, (cp.asarray(channels)[:, None], offsets),
+                      cp.asarray(amplitudes, dtype=cp.float32)[:, None] * kernel)
+    return signal
+
+def _simulate_stats_gpu(num_channels, num_samples, channels, spike_times, amplitudes, seed):
+    """
+    Simulate the signal on the GPU and reduce it there; only the three statistics
+    come back to the host.
+    """
+    signal = _simulate_signal_gpu(num_channels, num_samples, channels, spike_times,
+                                  amplitudes, seed)
+    magnitude = cp.abs(signal)
+    noise = _quiet_noise_kernel(signal, SPIKE_THRESHOLD)
+    return (float(magnitude.mean(dtype=cp.float64)), float(magnitude.max()), float(noise))
+
+_signal_buffers = threading.local()
+
+def _signal_buffer(num_channels, num_samples):
+    """
+    Per-thread float32 scratch window for the NumPy path. One flat buffer is grown
+    to the largest window seen and reused, so repeated populates do not allocate
+    (and page-fault in) fresh arrays for every recording.
+    """
+    size = num_channels * num_samples
+    buffer = getattr(_signal_buffers, 'buffer', None)
+    if buffer is None or buffer.size < size:
+        buffer = _signal_buffers.buffer = np.empty(size, dtype=np.float32)
+    return buffer[:size].reshape(num_channels, num_samples)
+
+def recording_seed(key):
+    """Seed for a recording's simulated signal, so repeated populates give the same stats"""
+    return [key['subject_id'], key['session_id'], key['recording_id']]
+
+def _draw_spikes(rng, num_channels, num_samples):
+    """
+    Channel, start sample and amplitude of every spike in a simulated recording.
+    These are the first draws from the recording's generator, so a plot can
+    rebuild the spikes behind the stored stats from the seed alone.
+    """
+    # A recording shorter than one spike gets none
+    num_spikes = rng.integers(50, 200) if num_samples > len(_SPIKE_KERNEL) else 0
+    channels = rng.integers(0, num_channels, num_spikes)
+    spike_times = rng.integers(0, num_samples - len(_SPIKE_KERNEL), num_spikes)
+    amplitudes = rng.uniform(50, 150, num_spikes)
+    return channels, spike_times, amplitudes
+
+def _simulated_windows(rng, num_channels, num_samples, channels, spike_times, amplitudes):
+    """
+    Yield the simulated signal one time window at a time, each window holding every
+    channel and about one stats tile of samples. Windows share one buffer, so the
+    full recording is never held in memory; spikes straddling a window edge are
+    split between the two windows.
+    """
+    window = max(1, _NUMPY_TILE // num_channels)
+    contributions = amplitudes.astype(np.float32)[:, None] * _SPIKE_KERNEL
+    for start in range(0, num_samples, window):
+        size = min(window, num_samples - start)
+        # float32 halves the memory every pass moves; sums still accumulate in float64
+        signal = rng.standard_normal(dtype=np.float32, out=_signal_buffer(num_channels, size))
+        signal *= np.float32(10)  # Noise
+        # One scatter adds every spike overlapping the window; add.at sums overlapping spikes
+        nearby = (spike_times < start + size) & (spike_times + len(_SPIKE_KERNEL) > start)
+        offsets = spike_times[nearby, None] + _SPIKE_OFFSETS - start
+        inside = (offsets >= 0) & (offsets < size)
+        np.add.at(signal,
+                  (np.broadcast_to(channels[nearby, None], offsets.shape)[inside], offsets[inside]),
+                  contributions[nearby][inside])
+        yield signal
+
+def _use_gpu(num_channels, num_samples):
+    return num_channels * num_samples >= GPU_MIN_SAMPLES and gpu_available()
+
+def simulate_stats(num_channels, sampling_rate, seed=None):
+    """
+    Simulate a recording's signal and return its mean amplitude, peak amplitude and noise level.
+    The same seed always gives the same signal on a given device.
+    """
+    # Generate synthetic neural data (random signals that look realistic)
+    num_samples = int(RECORDING_SECONDS * sampling_rate)
+    if num_channels <= 0 or num_samples <= 0:
+        # Placeholder recording with no samples: nothing to simulate
+        return 0.0, 0.0, 0.0
+    
+    # Each channel has baseline activity + some spikes; every spike is drawn at once
+    rng = np.random.default_rng(seed)
+    channels, spike_times, amplitudes = _draw_spikes(rng, num_channels, num_samples)
+    
+    if _use_gpu(num_channels, num_samples):
+        mean_amplitude, peak_amplitude, noise_level = _simulate_stats_gpu(
+            num_channels, num_samples, channels, spike_times, amplitudes,
+            int(rng.integers(2**63)))
+    elif numba is not None:
+        # Group the spikes by channel for the fused kernel
+        order = np.argsort(channels, kind='stable')
+        spike_index = np.searchsorted(channels[order], np.arange(num_channels + 1))
+        mean_amplitude, peak_amplitude, noise_level = (float(v) for v in _simulate_stats_kernel(
+            num_channels, num_samples, rng.integers(2**63), spike_index, spike_times[order],
+            amplitudes[order].astype(np.float32), _SPIKE_KERNEL, SPIKE_THRESHOLD))
+    else:
+        # Stream the signal in windows, reducing each as it is generated
+        magnitude_buffer = np.empty(max(_NUMPY_TILE, num_channels), dtype=np.float32)
+        mean_amplitude, peak_amplitude, noise_level = _combine_tile_moments(
+            (_tile_moments(window, SPIKE_THRESHOLD, magnitude_buffer)
+             for window in _simulated_windows(rng, num_channels, num_samples,
+                                              channels, spike_times, amplitudes)),
+            num_channels * num_samples)
+    return mean_amplitude, peak_amplitude, noise_level
+
+def simulate_signal(num_channels, sampling_rate, seed, plotted):
+    """
+    The signal simulate_stats reduces for the same seed, for the channels in plotted
+    only, as a (len(plotted), samples) float32 array. It is rebuilt along the same
+    path (GPU, numba or NumPy), so it matches the stored stats.
+    """
+    num_samples = int(RECORDING_SECONDS * sampling_rate)
+    plotted = np.asarray(plotted)
+    if num_channels <= 0 or num_samples <= 0:
+        # Placeholder recording with no samples, as in simulate_stats
+        return np.zeros((len(plotted), max(num_samples, 0)), dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    channels, spike_times, amplitudes = _draw_spikes(rng, num_channels, num_samples)
+    
+    if _use_gpu(num_channels, num_samples):
+        signal = _simulate_signal_gpu(num_channels, num_samples, channels, spike_times,
+                                      amplitudes, int(rng.integers(2**63)))
+        return cp.asnumpy(signal[cp.asarray(plotted)])
+    if numba is None:
+        # The windows are generated for every channel, as simulate_stats does
+        return np.concatenate([window[plotted] for window in _simulated_windows(
+            rng, num_channels, num_samples, channels, spike_times, amplitudes)], axis=1)
+    
+    signals = _channel_noise_kernel(plotted, num_samples, rng.integers(2**63))
+    # The kernel adds each channel's spikes in their drawn order
+    order = np.argsort(channels, kind='stable')
+    row_of = np.full(num_channels, -1)
+    row_of[plotted] = np.arange(len(plotted))
+    order = order[row_of[channels[order]] >= 0]
+    np.add.at(signals, (row_of[channels[order], None], spike_times[order, None] + _SPIKE_OFFSETS),
+              amplitudes[order].astype(np.float32)[:, None] * _SPIKE_KERNEL)
+    return signals
+
 @schema
 class RecordingStats(dj.Computed):
     definition = """
@@ -58,31 +431,11 @@ class RecordingStats(dj.Computed):
         """
         Compute statistics for a single recording.
         """
-        # Fetch recording info
-        recording_info = (Recording & key).fetch1()
+        # Fetch only the recording attributes the simulation needs
+        num_channels, sampling_rate = (Recording & key).fetch1('num_channels', 'sampling_rate')
         
-        # Simulate neural signal data - tril dummy values
-        num_channels = recording_info['num_channels']
-        sampling_rate = recording_info['sampling_rate']
-        duration_seconds = 10  
-        
-        # Generate synthetic neural data (random signals that look realistic)
-        num_samples = int(duration_seconds * sampling_rate)
-        
-        # Each channel has baseline activity + some spikes
-        signal = np.random.randn(num_channels, num_samples) * 10  # Noise
-        
-        num_spikes = np.random.randint(50, 200)
-        for _ in range(num_spikes):
-            channel = np.random.randint(0, num_channels)
-            spike_time = np.random.randint(0, num_samples - 100)
-            spike_amplitude = np.random.uniform(50, 150)
-            signal[channel, spike_time:spike_time+100] += spike_amplitude * np.exp(-np.linspace(0, 5, 100))
-        
-        # Compute statistics across all channels
-        mean_amplitude = float(np.mean(np.abs(signal)))
-        peak_amplitude = float(np.max(np.abs(signal)))
-        noise_level = float(np.std(signal[signal < 20]))  
+        mean_amplitude, peak_amplitude, noise_level = simulate_stats(
+            num_channels, sampling_rate, recording_seed(key))
         
         # Insert the stats data into RecordingStats table
         self.insert1({
@@ -92,11 +445,36 @@ class RecordingStats(dj.Computed):
             'noise_level': noise_level
         })
         
-        print(f"  → Mean: {mean_amplitude:.2f} μV, Peak: {peak_amplitude:.2f} μV, "
-              f"Noise: {noise_level:.2f} μV")
+        # Formatted only when debug logging is on; populate reports progress itself
+        logger.debug("  → Mean: %.2f μV, Peak: %.2f μV, Noise: %.2f μV",
+                     mean_amplitude, peak_amplitude, noise_level)
 
         pass
 
+    @classmethod
+    def populate_batch(cls, keys):
+        """
+        Compute the missing stats for the given recording keys and insert them with
+        a single query for the recordings and a single multi-row INSERT, rather than
+        a fetch, a transaction and an insert1 per recording as populate does.
+        Returns the number of rows inserted.
+        """
+        recordings = ((Recording & keys) - cls()).proj('num_channels', 'sampling_rate').fetch(as_dict=True)
+        rows = []
+        for recording in recordings:
+            mean_amplitude, peak_amplitude, noise_level = simulate_stats(
+                recording.pop('num_channels'), recording.pop('sampling_rate'),
+                recording_seed(recording))
+            rows.append({
+                **recording,
+                'mean_amplitude': mean_amplitude,
+                'peak_amplitude': peak_amplitude,
+                'noise_level': noise_level
+            })
+        # Another worker may have computed some of these keys in the meantime
+        cls.insert(rows, skip_duplicates=True, allow_direct_insert=True)
+        return len(rows)
+
 
 
 def populate_sample_data():
@@ -109,8 +487,6 @@ def populate_sample_data():
         {'subject_id': 4, 'subject_name': 'M003', 'species': 'mouse', 'sex': 'F', 'date_of_birth': date(2024, 1, 20)},
         {'subject_id': 5, 'subject_name': 'R002', 'species': 'rat', 'sex': 'M', 'date_of_birth': date(2024, 4, 12)},
     ]
-    Subject.insert(subjects, skip_duplicates=True)
-    print(f" Inserted {len(subjects)} subjects")
     
     # Insert 10 sessions
     sessions = [
@@ -125,8 +501,6 @@ def populate_sample_data():
         {'subject_id': 5, 'session_id': 1, 'session_date': date(2024, 6, 6), 'experimenter': 'Alice', 'brain_region': 'Striatum'},
         {'subject_id': 5, 'session_id': 2, 'session_date': date(2024, 6, 15), 'experimenter': 'Bob', 'brain_region': 'Striatum'},
     ]
-    Session.insert(sessions, skip_duplicates=True)
-    print(f" Inserted {len(sessions)} sessions")
     
     # Insert 20 recordings
     recordings = [
@@ -161,17 +535,38 @@ def populate_sample_data():
         {'subject_id': 5, 'session_id': 2, 'recording_id': 1, 'recording_time': time(10, 15), 'num_channels': 64, 'sampling_rate': 25000.0},
         {'subject_id': 5, 'session_id': 2, 'recording_id': 2, 'recording_time': time(11, 45), 'num_channels': 64, 'sampling_rate': 25000.0},
     ]
-    Recording.insert(recordings, skip_duplicates=True)
+    
+    # Insert all three tables in one transaction so the fixture commits once
+    with schema.connection.transaction:
+        Subject.insert(subjects, skip_duplicates=True)
+        Session.insert(sessions, skip_duplicates=True)
+        Recording.insert(recordings, skip_duplicates=True)
+    print(f" Inserted {len(subjects)} subjects")
+    print(f" Inserted {len(sessions)} sessions")
     print(f" Inserted {len(recordings)} recordings")
     
     print("\n=== Data Population Complete ===")
 
+def count_query():
+    """SQL returning subject, session, recording and stats counts in one row"""
+    return (
+        f'SELECT (SELECT COUNT(*) FROM {Subject().full_table_name}), '
+        f'(SELECT COUNT(*) FROM {Session().full_table_name}), '
+        f'(SELECT COUNT(*) FROM {Recording().full_table_name}), '
+        f'(SELECT COUNT(*) FROM {RecordingStats().full_table_name})'
+    )
+
+def table_counts():
+    """Subject, session, recording and stats counts in a single round trip"""
+    return schema.connection.query(count_query()).fetchone()
+
 def display_summary():
     """Display summary of database contents"""
+    num_subjects, num_sessions, num_recordings, _ = table_counts()
     print("\n=== Database Summary ===")
-    print(f"Total Subjects: {len(Subject())}")
-    print(f"Total Sessions: {len(Session())}")
-    print(f"Total Recordings: {len(Recording())}")
+    print(f"Total Subjects: {num_subjects}")
+    print(f"Total Sessions: {num_sessions}")
+    print(f"Total Recordings: {num_recordings}")
     
     print("\n--- Sample Subjects ---")
     print(Subject())
@@ -179,51 +574,150 @@ def display_summary():
     print("\n--- Sample Sessions ---")
     print(Session())
 
-def compute_all_statistics():
+def compute_all_statistics(processes=None):
+    """Populate every missing RecordingStats row on `processes` worker processes (default: all cores)"""
     print("\n=== Computing Recording Statistics ===")
-    print(f"Recordings without stats: {len(Recording() - RecordingStats())}")
+    # Every stats row belongs to one recording, so the pending count is a difference of counts
+    _, _, num_recordings, num_stats = table_counts()
+    print(f"Recordings without stats: {num_recordings - num_stats}")
     
-    RecordingStats.populate(display_progress=True) 
+    # Spread the recordings over the worker processes
+    completed = 0
+    for num_done in populate_stats_parallel(processes=processes):
+        completed += num_done
+        print(f"  {completed}/{num_recordings - num_stats} recordings done")
     
-    print(f"\nTotal statistics computed: {len(RecordingStats())}")
+    print(f"\nTotal statistics computed: {table_counts()[3]}")
     print("\n--- Sample Statistics ---")
     print(RecordingStats())
 
 
+# Most stats rows a parallel populate worker inserts in one statement
+MAX_INSERT_BATCH = 1000
+
+
+def _init_worker():
+    """
+    Pool initializer: open a fresh connection instead of sharing the parent's socket,
+    and keep the stats kernel to one thread since every core already runs a worker
+    """
+    schema.connection.connect()
+    if numba is not None:
+        numba.set_num_threads(1)
+
+
+def _populate_keys(keys):
+    RecordingStats.populate_batch(keys)
+    return len(keys)
+
+
+def populate_stats_parallel(keys=None, processes=None, chunk_size=None):
+    """
+    Populate missing RecordingStats across worker processes.
+    Each chunk of keys is computed by one worker and written with one INSERT; by
+    default a chunk is a quarter of a worker's share, between 4 and MAX_INSERT_BATCH rows.
+    Yields the number of recordings handled as each chunk of keys completes.
+    """
+    if keys is None:
+        keys = (Recording() - RecordingStats()).fetch('KEY')
+    if not keys:
+        return
+    # Random order, like populate(order='random'): another run working through the same
+    # backlog then rarely computes the same recordings at the same time
+    keys = random.sample(list(keys), len(keys))
+    processes = processes or os.cpu_count()
+    if chunk_size is None:
+        chunk_size = min(MAX_INSERT_BATCH, max(4, len(keys) // (processes * 4)))
+    chunks = [keys[i:i + chunk_size] for i in range(0, len(keys), chunk_size)]
+    with Pool(min(processes, len(chunks)), initializer=_init_worker) as pool:
+        yield from pool.imap_unordered(_populate_keys, chunks)
+
+
 #Visualization PARTS
 
-def visualize_recording_signal(subject_id, session_id, recording_id):
-    # Fetch recording info and stats
+# Most points drawn per channel trace in visualize_recording_signal
+MAX_PLOT_POINTS = 4000
+# Largest |noise| (6 noise stds) assumed when bounding how high a channel can reach
+_NOISE_MARGIN = 60.0
+
+def _peak_candidates(num_channels, num_samples, channels, spike_times, amplitudes, peak_amplitude):
+    """
+    The channels of a simulated recording that may hold its peak |x|. A channel can
+    only reach the peak through a spike plus the earlier spikes still decaying
+    under it, plus noise, so only channels where that bound reaches the stored
+    peak need rebuilding to find it.
+    """
+    if not len(channels):
+        return np.array([0])
+    # Spikes ordered by channel then time; channels are spaced so no window spans two
+    keys = channels * (2 * num_samples) + spike_times
+    order = np.argsort(keys)
+    keys = keys[order]
+    totals = np.concatenate([[0.0], np.cumsum(amplitudes[order])])
+    stacked = totals[1:] - totals[np.searchsorted(keys, keys - len(_SPIKE_KERNEL) + 1)]
+    reach = np.zeros(num_channels)
+    np.maximum.at(reach, channels[order], stacked)
+    candidates = np.flatnonzero(reach + _NOISE_MARGIN >= peak_amplitude)
+    if not len(candidates):
+        return np.array([np.argmax(reach)])
+    return candidates
+
+def visualize_recording_signal(subject_id, session_id, recording_id, show=True):
+    """
+    Plot a recording's busiest channels, save the plot and return its file name.
+    A recording with no channels or samples has nothing to plot and returns None.
+    """
+    import matplotlib.pyplot as plt
+
+    # Fetch recording info and stats in one joined query
     key = {'subject_id': subject_id, 'session_id': session_id, 'recording_id': recording_id}
-    recording_info = (Recording & key).fetch1()
-    stats = (RecordingStats & key).fetch1()
+    num_channels, sampling_rate, mean_amplitude, peak_amplitude, noise_level = (
+        (Recording * RecordingStats) & key).fetch1(
+        'num_channels', 'sampling_rate', 'mean_amplitude', 'peak_amplitude', 'noise_level')
     
-    num_channels = recording_info['num_channels']
-    sampling_rate = recording_info['sampling_rate']
-    duration_seconds = 1 
+    duration_seconds = RECORDING_SECONDS
     
     num_samples = int(duration_seconds * sampling_rate)
-    time_axis = np.linspace(0, duration_seconds, num_samples)
+    if num_channels <= 0 or num_samples <= 0:
+        print(f" No signal to plot for recording {recording_id} "
+              f"(subject {subject_id}, session {session_id})")
+        return None
     
-    # Plotting 4 channels
+    # Plotting 4 channels: the one holding the peak, then those with the most spikes
     channels_to_plot = min(4, num_channels)
+    seed = recording_seed(key)
+    spikes = _draw_spikes(np.random.default_rng(seed), num_channels, num_samples)
+    busiest = np.argsort(-np.bincount(spikes[0], minlength=num_channels), kind='stable')
+    candidates = _peak_candidates(num_channels, num_samples, *spikes, peak_amplitude)
+    
+    # Rebuild the peak candidates and the busiest channels of the signal make reduced
+    # from the recording's seed in one pass; the plotted rows are all among them
+    rebuilt = np.union1d(candidates, busiest[:channels_to_plot])
+    signals = simulate_signal(num_channels, sampling_rate, seed, rebuilt)
+    peaks = np.abs(signals[np.searchsorted(rebuilt, candidates)]).max(axis=1)
+    peak_channel = candidates[np.argmax(peaks)]
+    busiest = np.concatenate([[peak_channel], busiest[busiest != peak_channel]])
+    plotted = np.sort(busiest[:channels_to_plot])
+    signals = signals[np.searchsorted(rebuilt, plotted)]
     
-    fig, axes = plt.subplots(channels_to_plot, 1, figsize=(12, 8))
+    fig, axes = plt.subplots(channels_to_plot, 1, figsize=(12, 8), constrained_layout=True)
     fig.suptitle(f'Neural Recording: Subject {subject_id}, Session {session_id}, Recording {recording_id}\n'
-                 f'Mean: {stats["mean_amplitude"]:.2f} μV | Peak: {stats["peak_amplitude"]:.2f} μV | '
-                 f'Noise: {stats["noise_level"]:.2f} μV', fontsize=12, fontweight='bold')
+                 f'Mean: {mean_amplitude:.2f} μV | Peak: {peak_amplitude:.2f} μV | '
+                 f'Noise: {noise_level:.2f} μV', fontsize=12, fontweight='bold')
     
-    for ch in range(channels_to_plot):
-        # Generate synthetic signal for this channel
-        signal = np.random.randn(num_samples) * 10  
-        
-        # Adding Spikes
-        num_spikes = np.random.randint(3, 8)
-        for _ in range(num_spikes):
-            spike_time = np.random.randint(0, num_samples - 100)
-            spike_amplitude = np.random.uniform(50, 150)
-            signal[spike_time:spike_time+100] += spike_amplitude * np.exp(-np.linspace(0, 5, 100))
-        
+    # Draw at most MAX_PLOT_POINTS per trace: longer traces become the min/max of
+    # each bucket of samples, which keeps every spike's full height on screen;
+    # sample times are computed for the drawn points only
+    stride = -(-num_samples // (MAX_PLOT_POINTS // 2))
+    if stride > 1:
+        starts = np.arange(0, num_samples, stride)
+        signals = np.stack([np.minimum.reduceat(signals, starts, axis=1),
+                            np.maximum.reduceat(signals, starts, axis=1)], axis=2).reshape(channels_to_plot, -1)
+        time_axis = np.repeat(starts / sampling_rate, 2)
+    else:
+        time_axis = np.arange(num_samples) / sampling_rate
+    
+    for ch, signal in enumerate(signals):
         if channels_to_plot == 1:
             ax = axes
         else:
@@ -231,7 +725,7 @@ def visualize_recording_signal(subject_id, session_id, recording_id):
         
         # Plot the signal
         ax.plot(time_axis, signal, linewidth=0.5, color='black')
-        ax.set_ylabel(f'Channel {ch+1} (μV)', fontsize=10)
+        ax.set_ylabel(f'Channel {plotted[ch] + 1} (μV)', fontsize=10)
         ax.set_xlim([0, duration_seconds])
         ax.grid(True, alpha=0.3)
         
@@ -239,24 +733,56 @@ def visualize_recording_signal(subject_id, session_id, recording_id):
         if ch == channels_to_plot - 1:
             ax.set_xlabel('Time (seconds)', fontsize=10)
     
-    plt.tight_layout()
-    
     filename = f'recording_S{subject_id}_Sess{session_id}_Rec{recording_id}.png'
-    plt.savefig(filename, dpi=150, bbox_inches='tight')
+    # Fastest zlib level: PNG encoding dominates the save, for slightly larger files
+    plt.savefig(filename, dpi=150, pil_kwargs={'compress_level': 1})
     print(f" Saved plot: {filename}")
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+    return filename
+
+
+def _init_plot_worker():
+    """Pool initializer for plotting: a worker's own connection and the non-GUI Agg backend"""
+    import matplotlib
+    matplotlib.use('Agg')
+    _init_worker()
+
+
+def _plot_recording(key):
+    return visualize_recording_signal(key['subject_id'], key['session_id'],
+                                      key['recording_id'], show=False)
+
+
+def save_recording_plots(keys=None, processes=None):
+    """
+    Render and save the signal plot of every recording with stats across worker
+    processes, since matplotlib's rendering and PNG encoding hold a single core.
+    Yields each plot's file name as it is saved; recordings with nothing to plot are skipped.
+    """
+    if keys is None:
+        keys = RecordingStats().fetch('KEY')
+    if not keys:
+        return
+    processes = processes or os.cpu_count()
+    with Pool(min(processes, len(keys)), initializer=_init_plot_worker) as pool:
+        for filename in pool.imap_unordered(_plot_recording, keys):
+            if filename is not None:
+                yield filename
 
 
 def visualize_statistics_summary():
-    # Fetch all statistics
-    stats_data = RecordingStats.fetch(as_dict=True)
-    
-    mean_amps = [s['mean_amplitude'] for s in stats_data]
-    peak_amps = [s['peak_amplitude'] for s in stats_data]
-    noise_levels = [s['noise_level'] for s in stats_data]
+    import matplotlib.pyplot as plt
+
+    # Fetch only the three statistics columns, as float32 arrays; plotting needs no more precision
+    mean_amps, peak_amps, noise_levels = (
+        column.astype(np.float32)
+        for column in RecordingStats.fetch('mean_amplitude', 'peak_amplitude', 'noise_level'))
     
     # Create figure with 4 subplots
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10), constrained_layout=True)
     fig.suptitle('Recording Statistics Summary - All 20 Recordings', 
                  fontsize=16, fontweight='bold')
     
@@ -300,9 +826,7 @@ def visualize_statistics_summary():
     cbar = plt.colorbar(scatter, ax=axes[1, 1])
     cbar.set_label('Noise Level (μV)', fontsize=10)
     
-    plt.tight_layout()
-    
-    plt.savefig('statistics_summary.png', dpi=150, bbox_inches='tight')
+    plt.savefig('statistics_summary.png', dpi=150, pil_kwargs={'compress_level': 1})
     print(" Saved plot: statistics_summary.png")
     plt.show()
 